@@ -6,222 +6,486 @@ This server exposes REST endpoints for the industrial dashboard.
 It simulates real-time data ingestion from a CSV file.
 """
 
-from flask import Flask, jsonify, send_from_directory, request
+from flask import Flask, Response, jsonify, send_from_directory, request
 from werkzeug.utils import secure_filename
 import pandas as pd
+import numpy as np
+import collections
+import csv
+import functools
+import itertools
 import os
+import re
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from inference_engine import engine
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pac
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+from inference_engine import engine, queue_logger
+
+# Shares the engine's queued stdout writer, so app and engine lines stay in order
+log = queue_logger(__name__)
+
+# Bind hot-path engine attributes once instead of resolving them per request
+FEATURES = engine.FEATURES
+run_inference_batch = engine.run_inference_batch
+ENGINE_HAS_RESET = callable(getattr(engine, 'reset_state', None))
 
 app = Flask(__name__, static_folder='.')
 
 # File upload configuration
 UPLOAD_FOLDER = '.'
 ALLOWED_EXTENSIONS = {'csv'}
+ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB copy buffer when streaming uploads to disk
+
+# Browser cache lifetime for dashboard assets (index.html always revalidates).
+# The page links them as `name?v=<mtime>`, so a changed file gets a new URL.
+STATIC_MAX_AGE = 3600
+DASHBOARD_ASSETS = ('styles.css', 'dashboard.js')
+ASSET_VERSION_PATTERN = re.compile(
+    r'(' + '|'.join(re.escape(name) for name in DASHBOARD_ASSETS) + r')\?v=[^"\']*'
+)
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
+
+def _encode_numpy(obj):
+    """msgspec hook for NumPy scalars/arrays coming back from the engine."""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+if MSGSPEC_AVAILABLE:
+    MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_encode_numpy)
+
+def encode_json(payload):
+    """Encode a payload to JSON bytes with msgspec or orjson when available."""
+    if MSGSPEC_AVAILABLE:
+        return MSGSPEC_ENCODER.encode(payload)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return app.json.dumps(payload).encode('utf-8')
+
+def json_response(payload):
+    """Return a hot-path payload as a JSON response."""
+    return Response(encode_json(payload), mimetype='application/json')
 
 # --- Data Ingestion Layer ---
 DATA_FILE = 'pump_sensor_data_2000_anomaly.csv'
 if not os.path.exists(DATA_FILE):
     DATA_FILE = 'pump_sensor_sequence_1000_records.csv'
 
+def load_dataset(filepath):
+    """
+    Load a sensor CSV, reusing the last parse while the file is unchanged.
+
+    The cache is keyed on the file's mtime and size, so an admin reload of the
+    same dataset does not re-parse it, while an overwritten upload does.
+    """
+    stat = os.stat(filepath)
+    return _parse_dataset(filepath, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=1)
+def _parse_dataset(filepath, mtime_ns, size):
+    """
+    Parse a sensor CSV into a columnar float32 feature matrix.
+
+    Only the FEATURES columns are parsed and kept (in engine order), so each
+    simulated tick is a single contiguous row read instead of a per-row dict,
+    and the timestamp/status strings are never materialized.
+    Uses Arrow's multi-threaded CSV parser with a declared schema when pyarrow
+    is installed, otherwise the pandas C parser with explicit dtypes.
+    Returns (all_column_names, feature_matrix).
+    """
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        columns = next(csv.reader(f), [])
+
+    missing_columns = [col for col in FEATURES if col not in columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+    if PYARROW_AVAILABLE:
+        convert_options = pac.ConvertOptions(
+            column_types={f: pa.float32() for f in FEATURES},
+            include_columns=FEATURES
+        )
+        table = pac.read_csv(filepath, convert_options=convert_options)
+        matrix = np.column_stack([table.column(f).to_numpy() for f in FEATURES]).astype(np.float32, copy=False)
+    else:
+        frame = pd.read_csv(filepath, usecols=FEATURES, dtype={f: 'float32' for f in FEATURES}, engine='c')
+        matrix = frame[FEATURES].to_numpy(dtype=np.float32)
+
+    # The parse is shared between reloads, so guard it against mutation
+    matrix.flags.writeable = False
+    return columns, matrix
+
 # Load dataset into memory for simulation
-print(f"Loading data for ingestion simulation from {DATA_FILE}...")
-df = pd.read_csv(DATA_FILE)
-DATA_RECORDS = df.to_dict('records')
-CURRENT_RECORD_INDEX = 0
+log.info(f"Loading data for ingestion simulation from {DATA_FILE}...")
+DATA_COLUMNS, SENSOR_MATRIX = load_dataset(DATA_FILE)
+TOTAL_RECORDS = len(SENSOR_MATRIX)
+
+@dataclass(frozen=True, slots=True)
+class StreamCursor:
+    """
+    One replay of a dataset, swapped as a whole on reload or reset.
+    next() on itertools.count is atomic under the GIL, so concurrent polls
+    never receive the same row or skip one.
+    """
+    generation: int
+    matrix: np.ndarray
+    counter: itertools.count = field(default_factory=itertools.count)
+
+STREAM = StreamCursor(0, SENSOR_MATRIX)
+# Held across claiming a row and queueing it, so rows reach the worker in
+# stream order and never straddle a stream swap
+STREAM_LOCK = threading.Lock()
 
 # --- Dataset Metadata ---
 DATASET_METADATA = {
     "filename": os.path.basename(DATA_FILE),
     "filepath": DATA_FILE,
-    "total_records": len(DATA_RECORDS),
+    "total_records": TOTAL_RECORDS,
     "upload_time": datetime.now().isoformat(),
     "last_processed_time": None,
-    "columns": list(df.columns) if len(df) > 0 else []
+    "columns": DATA_COLUMNS
 }
 
 # --- State Store ---
+@dataclass(slots=True)
+class InferenceSnapshot:
+    """Last processed result, replaced as a whole on every ingest tick."""
+    version: int = 0
+    status: str = "INITIALIZING"
+    timestamp: str = None
+    record_number: int = 0
+    sensor_values: dict = field(default_factory=dict)
+    reconstruction_loss: float = 0.0
+    threshold: float = 0.05
+    latency_ms: float = 0.0
+    memory_mb: float = 0.0
+    is_anomaly: bool = False
+    sensor_states: dict = field(default_factory=dict)
+    sensor_anomaly_counts: dict = field(default_factory=dict)
+    total_anomalies: int = 0
+    recent_anomalies: int = 0
+
+@dataclass(slots=True)
+class LiveDataPayload:
+    """Body of /api/live-data; the fixed field layout keeps encoding tight."""
+    version: int
+    status: str
+    timestamp: str
+    record_number: int
+    total_records: int
+    values: dict
+    reconstruction_error: float
+    threshold: float
+    sensor_states: dict
+    sensor_anomaly_counts: dict
+    total_anomalies: int
+
+    @classmethod
+    def from_snapshot(cls, snapshot, status, record_number, total_records):
+        return cls(
+            version=snapshot.version,
+            status=status,
+            timestamp=snapshot.timestamp,
+            record_number=record_number,
+            total_records=total_records,
+            values=snapshot.sensor_values,
+            reconstruction_error=snapshot.reconstruction_loss,
+            threshold=snapshot.threshold,
+            sensor_states=snapshot.sensor_states,
+            sensor_anomaly_counts=snapshot.sensor_anomaly_counts,
+            total_anomalies=snapshot.total_anomalies
+        )
+
 # Holds the last processed result for decoupled API access
-LATEST_INFERENCE_RESULT = {
-    "status": "INITIALIZING",
-    "sensor_values": {},
-    "reconstruction_loss": 0,
-    "latency_ms": 0,
-    "memory_mb": 0,
-    "total_anomalies": 0,
-    "recent_anomalies": 0,
-    "sensor_states": {},
-    "sensor_anomaly_counts": {},
-    "timestamp": None
-}
+LATEST_INFERENCE_RESULT = InferenceSnapshot()
+
+# Bumped whenever LATEST_INFERENCE_RESULT changes. Read-only endpoints keep
+# their encoded body per version so repeated polls skip rebuild + encode.
+RESULT_VERSION = 0
+RESPONSE_CACHE = {}
+
+# HTTP caching for the read endpoints: browsers and a fronting proxy may reuse
+# a body for READ_CACHE_MAX_AGE seconds, then revalidate by ETag (-> 304).
+# The boot token keeps ETags unique across restarts, when versions start over.
+READ_CACHE_MAX_AGE = 1
+ETAG_BOOT_TOKEN = format(time.time_ns(), 'x')
+
+# Inference runs off the request thread. A single worker keeps rows in stream
+# order and serializes every access to the engine's rolling window.
+INFERENCE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+# Bounded backlog: polls block once this many rows are waiting on the worker
+MAX_PENDING_INFERENCES = 8
+INFERENCE_SLOTS = threading.BoundedSemaphore(MAX_PENDING_INFERENCES)
+# Rows waiting on the worker; each task drains whatever has queued up so a
+# backlog goes through the model as one batch
+PENDING_READINGS = collections.deque()
+# Running totals in an engine result; always taken from the newest row of a batch
+CUMULATIVE_RESULT_FIELDS = ('sensor_anomaly_counts', 'total_anomalies', 'recent_anomalies', 'memory_mb')
+# Stream generation the engine's window and counters belong to (worker only)
+ENGINE_GENERATION = 0
+
+def publish_result(**fields):
+    """Swap in a new latest snapshot, then bump the version readers cache on."""
+    global LATEST_INFERENCE_RESULT, RESULT_VERSION
+    version = RESULT_VERSION + 1
+    LATEST_INFERENCE_RESULT = InferenceSnapshot(version=version, **fields)
+    RESULT_VERSION = version
+
+def start_new_stream(matrix):
+    """Replay `matrix` from the first row; rows claimed from the old stream go stale."""
+    global STREAM
+    with STREAM_LOCK:
+        STREAM = StreamCursor(STREAM.generation + 1, matrix)
+
+def sync_engine_generation(generation):
+    """
+    Reset the engine and publish an empty result when a new stream starts.
+    Runs on the inference worker, so it is ordered with the queued rows.
+    """
+    global ENGINE_GENERATION
+    if ENGINE_GENERATION == generation:
+        return
+    if ENGINE_HAS_RESET:
+        engine.reset_state()
+    ENGINE_GENERATION = generation
+    publish_result()
+
+def reset_engine_state():
+    """Reset the engine for the current stream, after any queued rows."""
+    INFERENCE_POOL.submit(sync_engine_generation, STREAM.generation).result()
+
+def release_inference_slot(future):
+    """Done-callback for inference tasks: free the backlog slot, report failures."""
+    INFERENCE_SLOTS.release()
+    error = future.exception()
+    if error is not None:
+        log.error(f"[ERROR] Inference error: {error!r}", exc_info=error)
+
+def cached_json_body(key, build_payload):
+    """Return (version, body) for `key`, re-encoding only after a new result."""
+    version = RESULT_VERSION
+    cached = RESPONSE_CACHE.get(key)
+    if cached is None or cached[0] != version:
+        cached = (version, encode_json(build_payload()))
+        RESPONSE_CACHE[key] = cached
+    return cached
+
+def cached_json_response(key, build_payload):
+    """Serve the cached body for `key` with HTTP revalidation headers."""
+    cached = cached_json_body(key, build_payload)
+    response = Response(cached[1], mimetype='application/json')
+    response.set_etag(f"{ETAG_BOOT_TOKEN}-{cached[0]}")
+    response.cache_control.public = True
+    response.cache_control.max_age = READ_CACHE_MAX_AGE
+    return response.make_conditional(request)
+
+def compile_row_builder(features):
+    """
+    Generate `build(values) -> dict` with the feature names baked into a dict
+    literal. FEATURES never changes at runtime, so this is built once at import.
+    """
+    items = ", ".join(f"{name!r}: values[{i}]" for i, name in enumerate(features))
+    namespace = {}
+    exec(f"def build_feature_row(values):\n    return {{{items}}}\n", namespace)
+    return namespace['build_feature_row']
+
+build_feature_row = compile_row_builder(FEATURES)
 
 def get_next_sensor_reading():
-    """Simulates 1 row per second stream."""
-    global CURRENT_RECORD_INDEX
+    """
+    Simulates 1 row per second stream.
+    Returns (generation, record_number, row) or None once the dataset is exhausted.
+    """
+    stream = STREAM
+    index = next(stream.counter)
     
     # Stop at the end - do not loop
-    if CURRENT_RECORD_INDEX >= len(DATA_RECORDS):
+    if index >= len(stream.matrix):
         return None
     
-    row = DATA_RECORDS[CURRENT_RECORD_INDEX]
-    CURRENT_RECORD_INDEX += 1
-    return row
+    # Build the row dict lazily, for the engine features only
+    row = build_feature_row(stream.matrix[index].tolist())
+    return stream.generation, index + 1, row
 
 def reload_data_from_file(filepath):
     """Reload data from a new CSV file and reset all state."""
-    global DATA_FILE, df, DATA_RECORDS, CURRENT_RECORD_INDEX, LATEST_INFERENCE_RESULT, DATASET_METADATA
+    global DATA_FILE, DATA_COLUMNS, SENSOR_MATRIX, TOTAL_RECORDS, DATASET_METADATA
     
-    print(f"[RELOAD] Reloading data from {filepath}...")
+    log.info(f"[RELOAD] Reloading data from {filepath}...")
     
     # Validate file exists
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"File not found: {filepath}")
     
-    # Load new dataset
-    DATA_FILE = filepath
-    df = pd.read_csv(DATA_FILE)
-    
-    # Validate required columns
-    required_columns = [
-        'Motor_RPM', 'Bearing_Temperature_C', 'Oil_Pressure_bar', 'Vibration_mm_s',
-        'Flow_Rate_L_min', 'Suction_Pressure_bar', 'Discharge_Pressure_bar',
-        'Motor_Current_A', 'Casing_Temperature_C', 'Ambient_Temperature_C'
-    ]
+    # Load new dataset (includes required column validation)
+    columns, matrix = load_dataset(filepath)
     
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
-    
-    DATA_RECORDS = df.to_dict('records')
-    CURRENT_RECORD_INDEX = 0
+    DATA_FILE = filepath
+    DATA_COLUMNS, SENSOR_MATRIX = columns, matrix
+    TOTAL_RECORDS = len(SENSOR_MATRIX)
+    start_new_stream(SENSOR_MATRIX)
     
     # Update metadata
     DATASET_METADATA = {
         "filename": os.path.basename(filepath),
         "filepath": filepath,
-        "total_records": len(DATA_RECORDS),
+        "total_records": TOTAL_RECORDS,
         "upload_time": datetime.now().isoformat(),
         "last_processed_time": None,
-        "columns": list(df.columns)
-    }
-    
-    # Reset ML state
-    LATEST_INFERENCE_RESULT = {
-        "status": "INITIALIZING",
-        "sensor_values": {},
-        "reconstruction_loss": 0,
-        "latency_ms": 0,
-        "memory_mb": 0,
-        "total_anomalies": 0,
-        "recent_anomalies": 0,
-        "sensor_states": {},
-        "sensor_anomaly_counts": {},
-        "timestamp": None,
-        "threshold": 0.05,
-        "is_anomaly": False
+        "columns": DATA_COLUMNS
     }
     
-    # Reset inference engine state
-    if hasattr(engine, 'reset_state'):
-        engine.reset_state()
+    # Reset inference engine and ML state once the old stream's rows are done
+    reset_engine_state()
     
-    print(f"[SUCCESS] Data reloaded: {len(DATA_RECORDS)} records from {os.path.basename(filepath)}")
-    return len(DATA_RECORDS)
+    log.info(f"[SUCCESS] Data reloaded: {TOTAL_RECORDS} records from {os.path.basename(filepath)}")
+    return TOTAL_RECORDS
 
 
 # --- API Endpoints ---
 
 @app.route('/')
 def home():
-    """Serve the dashboard UI."""
-    return send_from_directory('.', 'index.html')
+    """Serve the dashboard UI, with asset URLs versioned by file mtime."""
+    mtimes = tuple(os.stat(name).st_mtime_ns for name in ('index.html',) + DASHBOARD_ASSETS)
+    response = Response(render_index(mtimes), mimetype='text/html')
+    response.add_etag()
+    return response.make_conditional(request)
 
-@app.route('/api/live-data', methods=['GET'])
-def get_live_data():
+@functools.lru_cache(maxsize=1)
+def render_index(mtimes):
+    """index.html with each `asset?v=...` token replaced by that asset's mtime."""
+    versions = dict(zip(DASHBOARD_ASSETS, (format(m, 'x') for m in mtimes[1:])))
+    with open('index.html', encoding='utf-8') as f:
+        html = f.read()
+    return ASSET_VERSION_PATTERN.sub(lambda m: f"{m[1]}?v={versions[m[1]]}", html)
+
+def process_pending_readings():
     """
-    Simulates real-time sensor stream.
-    Each call processes one new row from the dataset.
-    Stops when reaching the end.
+    Run inference for all queued rows and publish one result for the batch:
+    its most severe ANOMALY row if it has one, otherwise the newest row.
     """
-    global LATEST_INFERENCE_RESULT
+    batch = []
+    while PENDING_READINGS:
+        batch.append(PENDING_READINGS.popleft())
     
-    # 1. Ingest next reading
-    raw_row = get_next_sensor_reading()
+    # Drop rows claimed from a stream that has since been reloaded or reset
+    generation = STREAM.generation
+    sync_engine_generation(generation)
+    batch = [reading for reading in batch if reading[0] == generation]
+    if not batch:
+        return  # An earlier task already drained this row
     
-    # Handle completion - dataset finished
-    if raw_row is None:
-        return jsonify({
-            "status": "COMPLETED",
-            "record_number": len(DATA_RECORDS),
-            "total_records": len(DATA_RECORDS),
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
-            "values": LATEST_INFERENCE_RESULT.get("sensor_values", {}),
-            "reconstruction_error": LATEST_INFERENCE_RESULT.get("reconstruction_loss", 0),
-            "sensor_states": LATEST_INFERENCE_RESULT.get("sensor_states", {}),
-            "sensor_anomaly_counts": LATEST_INFERENCE_RESULT.get("sensor_anomaly_counts", {}),
-            "threshold": LATEST_INFERENCE_RESULT.get("threshold", 0.05),
-            "total_anomalies": LATEST_INFERENCE_RESULT.get("total_anomalies", 0)
-        })
+    _, record_numbers, raw_rows = zip(*batch)
+    results = run_inference_batch(list(raw_rows))
     
-    # 2. Perform Inference
-    inference_out = engine.run_inference(raw_row)
+    # A coalesced batch must not hide an alert behind a later NORMAL row; the
+    # counters still come from the newest row so they include the whole batch
+    anomalies = [i for i, result in enumerate(results) if result['is_anomaly']]
+    pick = max(anomalies, key=lambda i: results[i]['reconstruction_loss']) if anomalies else -1
+    inference_out = results[pick]
+    if pick != -1:
+        inference_out = {**inference_out, **{k: results[-1][k] for k in CUMULATIVE_RESULT_FIELDS}}
     
-    # 3. Cache & Augment Result
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    LATEST_INFERENCE_RESULT = {
-        "timestamp": timestamp,
-        "sensor_values": {k: raw_row[k] for k in engine.FEATURES},
+    # Stamp once per tick; other endpoints reuse the stored timestamp
+    now = datetime.now()
+    publish_result(
+        timestamp=now.strftime("%H:%M:%S"),
+        record_number=record_numbers[pick],
+        sensor_values=raw_rows[pick],
         **inference_out
-    }
+    )
     
     # Update last processed time
-    DATASET_METADATA["last_processed_time"] = datetime.now().isoformat()
+    DATASET_METADATA["last_processed_time"] = now.isoformat()
+
+@app.route('/api/live-data', methods=['GET'])
+def get_live_data():
+    """
+    Simulates real-time sensor stream.
+    Each call ingests one new row from the dataset and queues it for inference,
+    then returns the latest finished result; `version` lets clients spot repeats.
+    Stops when reaching the end.
+    """
+    # 1. Ingest next reading, waiting while the inference backlog is full
+    INFERENCE_SLOTS.acquire()
+    with STREAM_LOCK:
+        reading = get_next_sensor_reading()
+        if reading is not None:
+            PENDING_READINGS.append(reading)
     
-    return jsonify({
-        "timestamp": timestamp,
-        "record_number": CURRENT_RECORD_INDEX,
-        "total_records": len(DATA_RECORDS),
-        "values": LATEST_INFERENCE_RESULT["sensor_values"],
-        "status": LATEST_INFERENCE_RESULT["status"],
-        "reconstruction_error": LATEST_INFERENCE_RESULT["reconstruction_loss"],
-        "threshold": LATEST_INFERENCE_RESULT["threshold"],
-        "sensor_states": LATEST_INFERENCE_RESULT["sensor_states"],
-        "sensor_anomaly_counts": LATEST_INFERENCE_RESULT["sensor_anomaly_counts"]
-    })
+    # Handle completion - dataset finished
+    # Idle dashboards keep polling here, so the body is encoded once per result
+    if reading is None:
+        INFERENCE_SLOTS.release()
+        # Let the queued rows finish first so the final counts are published
+        INFERENCE_POOL.submit(process_pending_readings).result()
+        _, body = cached_json_body('live-data-completed', lambda: LiveDataPayload.from_snapshot(
+            LATEST_INFERENCE_RESULT, "COMPLETED", TOTAL_RECORDS, TOTAL_RECORDS
+        ))
+        return Response(body, mimetype='application/json')
+    
+    # 2. Perform Inference (in stream order, off the request thread)
+    future = INFERENCE_POOL.submit(process_pending_readings)
+    future.add_done_callback(release_inference_slot)
+    
+    # 3. Serve the latest finished result
+    snapshot = LATEST_INFERENCE_RESULT
+    return json_response(LiveDataPayload.from_snapshot(
+        snapshot, snapshot.status, snapshot.record_number, TOTAL_RECORDS
+    ))
 
 @app.route('/api/anomaly-status', methods=['GET'])
 def get_anomaly_status():
     """Exposes current system state and reconstruction metrics."""
-    return jsonify({
-        "system_status": LATEST_INFERENCE_RESULT["status"],
-        "reconstruction_loss": LATEST_INFERENCE_RESULT["reconstruction_loss"],
-        "threshold": LATEST_INFERENCE_RESULT["threshold"],
-        "is_anomaly": LATEST_INFERENCE_RESULT["is_anomaly"]
+    return cached_json_response('anomaly-status', lambda: {
+        "system_status": LATEST_INFERENCE_RESULT.status,
+        "reconstruction_loss": LATEST_INFERENCE_RESULT.reconstruction_loss,
+        "threshold": LATEST_INFERENCE_RESULT.threshold,
+        "is_anomaly": LATEST_INFERENCE_RESULT.is_anomaly
     })
 
 @app.route('/api/anomaly-count', methods=['GET'])
 def get_anomaly_count():
     """Exposes total and recent anomaly counts."""
-    return jsonify({
-        "total": LATEST_INFERENCE_RESULT["total_anomalies"],
-        "last_hour": LATEST_INFERENCE_RESULT["recent_anomalies"],
-        "per_sensor": LATEST_INFERENCE_RESULT["sensor_anomaly_counts"]
+    return cached_json_response('anomaly-count', lambda: {
+        "total": LATEST_INFERENCE_RESULT.total_anomalies,
+        "last_hour": LATEST_INFERENCE_RESULT.recent_anomalies,
+        "per_sensor": LATEST_INFERENCE_RESULT.sensor_anomaly_counts
     })
 
 @app.route('/api/system-health', methods=['GET'])
 def get_system_health():
     """Exposes performance metrics (benchmarking)."""
-    return jsonify({
-        "inference_latency_ms": LATEST_INFERENCE_RESULT["latency_ms"],
-        "memory_usage_mb": LATEST_INFERENCE_RESULT["memory_mb"],
+    return cached_json_response('system-health', lambda: {
+        "inference_latency_ms": LATEST_INFERENCE_RESULT.latency_ms,
+        "memory_usage_mb": LATEST_INFERENCE_RESULT.memory_mb,
         "data_stream": "ACTIVE",
-        "model_status": "LOADED" if engine.model else "SIMULATED"
+        "model_status": "LOADED" if engine.model or engine.interpreter is not None else "SIMULATED"
     })
 
 @app.route('/api/dataset-info', methods=['GET'])
@@ -232,7 +496,7 @@ def get_dataset_info():
         "total_records": DATASET_METADATA["total_records"],
         "upload_time": DATASET_METADATA["upload_time"],
         "last_processed_time": DATASET_METADATA["last_processed_time"],
-        "current_record": CURRENT_RECORD_INDEX,
+        "current_record": LATEST_INFERENCE_RESULT.record_number,
         "columns": DATASET_METADATA["columns"]
     })
 
@@ -254,34 +518,45 @@ def reload_dataset():
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Reload error: {str(e)}")
+        log.error(f"[ERROR] Reload error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/admin/upload-data', methods=['POST'])
 def upload_data():
-    """Admin endpoint to upload and reload a new CSV dataset."""
+    """
+    Admin endpoint to upload and reload a new CSV dataset.
+    Accepts a raw `text/csv` body (name in the `filename` query arg), which is
+    streamed straight to disk, or a multipart form with a `file` field.
+    """
     try:
-        # Check if file is in request
-        if 'file' not in request.files:
-            return jsonify({"error": "No file provided"}), 400
-        
-        file = request.files['file']
+        if request.mimetype == 'text/csv':
+            filename = request.args.get('filename', '')
+            source = request.stream
+        else:
+            # Check if file is in request
+            if 'file' not in request.files:
+                return jsonify({"error": "No file provided"}), 400
+            
+            file = request.files['file']
+            filename = file.filename
+            source = file.stream
         
         # Check if file is selected
-        if file.filename == '':
+        if filename == '':
             return jsonify({"error": "No file selected"}), 400
         
         # Validate file type
-        if not allowed_file(file.filename):
+        if not allowed_file(filename):
             return jsonify({"error": "Invalid file type. Only CSV files are allowed."}), 400
         
         # Secure the filename
-        filename = secure_filename(file.filename)
+        filename = secure_filename(filename)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         
-        # Save the file
-        file.save(filepath)
-        print(f"[UPLOAD] File saved: {filepath}")
+        # Stream the file to disk in fixed-size chunks
+        with open(filepath, 'wb') as out:
+            shutil.copyfileobj(source, out, UPLOAD_CHUNK_SIZE)
+        log.info(f"[UPLOAD] File saved: {filepath}")
         
         # Reload data into memory (includes column validation)
         try:
@@ -301,32 +576,14 @@ def upload_data():
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Upload error: {str(e)}")
+        log.error(f"[ERROR] Upload error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/admin/reset-counters', methods=['POST'])
 def reset_counters():
     """Reset anomaly counters and ML state."""
-    global CURRENT_RECORD_INDEX, LATEST_INFERENCE_RESULT
-    
-    CURRENT_RECORD_INDEX = 0
-    LATEST_INFERENCE_RESULT = {
-        "status": "INITIALIZING",
-        "sensor_values": {},
-        "reconstruction_loss": 0,
-        "latency_ms": 0,
-        "memory_mb": 0,
-        "total_anomalies": 0,
-        "recent_anomalies": 0,
-        "sensor_states": {},
-        "sensor_anomaly_counts": {},
-        "timestamp": None,
-        "threshold": 0.05,
-        "is_anomaly": False
-    }
-    
-    if hasattr(engine, 'reset_state'):
-        engine.reset_state()
+    start_new_stream(SENSOR_MATRIX)
+    reset_engine_state()
     
     return jsonify({"success": True, "message": "Counters reset successfully"}), 200
 
@@ -334,14 +591,14 @@ def reset_counters():
 # --- Static File Serving ---
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory('.', path)
+    return send_from_directory('.', path, max_age=STATIC_MAX_AGE)
 
 if __name__ == "__main__":
-    print(f"--- End-to-End Anomaly Detection Backend Active ---")
-    print(f"API Endpoints available:")
-    print(f" - GET /api/live-data")
-    print(f" - GET /api/anomaly-status")
-    print(f" - GET /api/anomaly-count")
-    print(f" - GET /api/system-health")
+    log.info(f"--- End-to-End Anomaly Detection Backend Active ---")
+    log.info(f"API Endpoints available:")
+    log.info(f" - GET /api/live-data")
+    log.info(f" - GET /api/anomaly-status")
+    log.info(f" - GET /api/anomaly-count")
+    log.info(f" - GET /api/system-health")
     app.run(host='0.0.0.0', port=5003, debug=False)
 
@@ -0,0 +1,124 @@
+"""
+Advanced Anomaly Detection for Industrial Pumps
+Phase 1b: TFLite Conversion for Low-Latency Inference
+
+Converts the trained LSTM Autoencoder into TFLite models for the inference engine:
+- int8: full-integer post-training quantization, calibrated on NORMAL windows
+  scaled with the same scaler the inference engine uses.
+- fp16: float16 weights, no calibration needed; eligible for the GPU delegate.
+Run after train_lstm_autoencoder.py. The engine prefers int8, then fp16, then
+the Keras model (lstm_model.keras).
+"""
+
+import pandas as pd
+import numpy as np
+import tensorflow as tf
+import multiprocessing
+import os
+
+from train_lstm_autoencoder import (
+    DATA_FILE, MODEL_PATH, SCALER_PATH, WINDOW_SIZE, FEATURES, load_scaler, create_scaled_windows
+)
+
+# --- Configuration ---
+TFLITE_INT8_PATH = 'lstm_model_int8.tflite'
+TFLITE_FP16_PATH = 'lstm_model_fp16.tflite'
+CALIBRATION_WINDOWS = 100
+
+def load_calibration_windows():
+    """
+    Builds the representative dataset: ~100 scaled NORMAL windows of shape
+    (WINDOW_SIZE, features), spread evenly across the recording.
+    """
+    df = pd.read_csv(DATA_FILE).ffill()
+    normal_data = df[df.machine_status == "NORMAL"][FEATURES].values
+    windows = create_scaled_windows(normal_data, WINDOW_SIZE, load_scaler(SCALER_PATH))
+
+    picks = np.linspace(0, len(windows) - 1, num=min(CALIBRATION_WINDOWS, len(windows)), dtype=int)
+    return windows[picks]
+
+def fixed_shape_converter(model):
+    """
+    Converter over a batch-1 copy of the model. A static input shape lets the
+    LSTM loops lower to TFLite builtins and the weights freeze into constants.
+    """
+    inputs = tf.keras.Input(shape=(WINDOW_SIZE, len(FEATURES)), batch_size=1)
+    fixed_model = tf.keras.Model(inputs, model(inputs))
+    return tf.lite.TFLiteConverter.from_keras_model(fixed_model)
+
+def convert_int8(model, calibration_windows):
+    """Full-integer quantization: int8 weights, activations, input and output."""
+    converter = fixed_shape_converter(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    def representative_dataset():
+        for window in calibration_windows:
+            yield [window[np.newaxis, ...]]
+
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    return converter.convert()
+
+def convert_fp16(model):
+    """Float16 weight quantization; the float32 window input passes through unchanged."""
+    converter = fixed_shape_converter(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+def convert_int8_to_file(model_path, calibration_windows, path):
+    """Child-process entry point: load the model, quantize it to int8 and save it."""
+    model = tf.keras.models.load_model(model_path, compile=False)
+    save_tflite(path, convert_int8(model, calibration_windows))
+
+def convert_int8_isolated(calibration_windows):
+    """
+    Run the int8 conversion in a child process. The TFLite calibrator can
+    crash the interpreter outright (a segfault on some TF releases), which no
+    try/except catches; isolated, a crash only costs the int8 model.
+    Returns the child's exit code (0 on success, negative for a signal).
+    """
+    process = multiprocessing.get_context('spawn').Process(
+        target=convert_int8_to_file, args=(MODEL_PATH, calibration_windows, TFLITE_INT8_PATH)
+    )
+    process.start()
+    process.join()
+    return process.exitcode
+
+def save_tflite(path, tflite_model):
+    """Write to a temporary name and rename, so `path` is never half-written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(tflite_model)
+    os.replace(tmp_path, path)
+    print(f"Saved {path} ({len(tflite_model) / 1024:.1f} KB)")
+
+def main():
+    print("--- Phase 1b: Converting LSTM Autoencoder to TFLite ---")
+
+    for path in (MODEL_PATH, SCALER_PATH, DATA_FILE):
+        if not os.path.exists(path):
+            print(f"Error: {path} not found. Run train_lstm_autoencoder.py first.")
+            return
+
+    model = tf.keras.models.load_model(MODEL_PATH, compile=False)
+
+    print("Converting FP16 model...")
+    save_tflite(TFLITE_FP16_PATH, convert_fp16(model))
+
+    calibration_windows = load_calibration_windows()
+    print(f"Calibrating int8 quantization on {len(calibration_windows)} normal windows...")
+    exitcode = convert_int8_isolated(calibration_windows)
+    if exitcode != 0:
+        # The engine prefers int8: an older int8 model would be served with the new scaler/threshold
+        for path in (TFLITE_INT8_PATH, TFLITE_INT8_PATH + '.tmp'):
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"Warning: int8 conversion failed (exit code {exitcode}). The engine will use the FP16 model.")
+
+    print("Phase 1b Complete.")
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ const APP_STATE = {
     systemState: 'LEARNING', // LEARNING | NORMAL | WARNING | CRITICAL
     streamInterval: null,
     backendOffline: false, // Track backend connection status
+    lastResultVersion: 0, // Version of the last inference result rendered
 
     // Dataset metadata
     dataset: {
@@ -221,6 +222,10 @@ async function fetchLiveStep() {
             return;
         }
 
+        // Inference runs in the background; skip polls that return the same result
+        if (data.version === APP_STATE.lastResultVersion) return;
+        APP_STATE.lastResultVersion = data.version;
+
         // 2. Update App State (Task 3 & 6)
         APP_STATE.lastAnomalyScore = data.reconstruction_error || 0;
         APP_STATE.systemState = data.status;
@@ -266,7 +271,7 @@ async function fetchLiveStep() {
         if (responseHealth.ok) {
             const health = await responseHealth.json();
             if (document.getElementById('inference-latency')) {
-                document.getElementById('inference-latency').innerText = health.inference_latency_ms;
+                document.getElementById('inference-latency').innerText = Number(health.inference_latency_ms).toFixed(2);
             }
             if (document.getElementById('memory-usage')) {
                 document.getElementById('memory-usage').innerText = health.memory_usage_mb;
@@ -433,13 +438,12 @@ async function uploadNewDataset() {
 
     showLoadingOverlay('Uploading and validating dataset...');
 
-    const formData = new FormData();
-    formData.append('file', file);
-
     try {
-        const response = await fetch('/api/admin/upload-data', {
+        // Send the raw CSV body so the backend can stream it straight to disk
+        const response = await fetch(`/api/admin/upload-data?filename=${encodeURIComponent(file.name)}`, {
             method: 'POST',
-            body: formData
+            headers: { 'Content-Type': 'text/csv' },
+            body: file
         });
 
         const result = await response.json();
@@ -6,195 +6,463 @@ This module handles live data processing, reconstruction using the LSTM model,
 and anomaly detection logic. It includes benchmarking for latency and memory usage.
 """
 
-import numpy as np
-import pandas as pd
-try:
-    import tensorflow as tf
-    TF_AVAILABLE = True
-except ImportError as e:
-    print(f"--- WARNING: TensorFlow could not be initialized ({e}) ---")
-    print("Inference will proceed using fallback heuristic simulation.")
-    TF_AVAILABLE = False
-import joblib
+import atexit
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import sys
 import time
+from collections import deque
+import numpy as np
+import pandas as pd
+import joblib
 try:
     import psutil
     PSUTIL_AVAILABLE = True
 except ImportError:
     PSUTIL_AVAILABLE = False
-from collections import deque
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+try:
+    from sklearn.preprocessing import MinMaxScaler, StandardScaler
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# Diagnostics go through a queue; a background listener does the blocking
+# stdout writes so the inference worker never waits on a flush
+LOG_QUEUE = queue.SimpleQueue()
+LOG_LISTENER = logging.handlers.QueueListener(LOG_QUEUE, logging.StreamHandler(sys.stdout))
+LOG_LISTENER.start()
+atexit.register(LOG_LISTENER.stop)
+
+def queue_logger(name):
+    """
+    Logger for `name` that writes bare messages through the shared queue.
+    Handlers stay on the named logger, so the root logger (and with it
+    Flask/werkzeug logging) is left as the host process configured it.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(logging.handlers.QueueHandler(LOG_QUEUE))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+log = queue_logger(__name__)
+
+# The autoencoder sees batches of 1-8 tiny windows, where thread hand-offs cost
+# more than they parallelize. Pin TF to one thread per op unless overridden;
+# must be set before TensorFlow is imported.
+os.environ.setdefault('TF_NUM_INTRAOP_THREADS', '1')
+os.environ.setdefault('TF_NUM_INTEROP_THREADS', '1')
+INFERENCE_THREADS = int(os.environ['TF_NUM_INTRAOP_THREADS'])
+try:
+    import tensorflow as tf
+    TF_AVAILABLE = True
+except ImportError as e:
+    log.warning(f"--- WARNING: TensorFlow could not be initialized ({e}) ---")
+    log.warning("Inference will proceed using fallback heuristic simulation.")
+    TF_AVAILABLE = False
 
 # --- Configuration ---
-MODEL_PATH = 'lstm_model.h5'
-SCALER_PATH = 'scaler.pkl'
-THRESHOLD_PATH = 'threshold.json'
+MODEL_PATH = 'lstm_model.keras'
+LEGACY_MODEL_PATH = 'lstm_model.h5'  # HDF5 model from older training runs
+TFLITE_INT8_PATH = 'lstm_model_int8.tflite'  # Produced by convert_tflite.py
+TFLITE_FP16_PATH = 'lstm_model_fp16.tflite'
+GPU_DELEGATE_LIB = 'libtensorflowlite_gpu_delegate.so'
+SCALER_NPZ_PATH = 'scaler.npz'  # Min-max parameters + threshold from train_lstm_autoencoder.py
+SCALER_PATH = 'scaler.pkl'  # Legacy pickled sklearn scaler
+THRESHOLD_PATH = 'threshold.json'  # Legacy threshold file
 WINDOW_SIZE = 30
+SCALER_PROBE_VALUES = np.array([-1000.0, -1.0, 0.0, 1.0, 1000.0], dtype=np.float32)  # cache_scaler_params check
+MEMORY_SAMPLE_INTERVAL = 2.0  # Seconds between RSS samples; memory barely moves per tick
+SENSOR_STATE_LABELS = ("NORMAL", "ANOMALY")  # Indexed by the per-sensor anomaly flag
 FEATURES = [
     'Motor_RPM', 'Bearing_Temperature_C', 'Oil_Pressure_bar', 'Vibration_mm_s', 
     'Flow_Rate_L_min', 'Suction_Pressure_bar', 'Discharge_Pressure_bar', 
     'Motor_Current_A', 'Casing_Temperature_C', 'Ambient_Temperature_C'
 ]
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def update_transitions(errors, limit, anomalous, counts):
+        """Flag sensors above `limit`, counting NORMAL -> ANOMALY transitions in place."""
+        for i in range(errors.shape[0]):
+            current = errors[i] > limit
+            if current and not anomalous[i]:
+                counts[i] += 1
+            anomalous[i] = current
+else:
+    def update_transitions(errors, limit, anomalous, counts):
+        """NumPy version of the transition kernel for when numba is not installed."""
+        current = errors > limit
+        counts += current & ~anomalous
+        anomalous[:] = current
+
 class AnomalyInferenceEngine:
     def __init__(self):
         self.FEATURES = FEATURES
         self.model = None
+        self.interpreter = None
+        self.predict_fns = {} # Batch size -> traced Keras forward pass
         self.scaler = None
+        self.scale_mul = None # Scaler folded into x * scale_mul + scale_add
+        self.scale_add = None
         self.threshold = 0.05 # Default if not found
-        self.buffer = deque(maxlen=WINDOW_SIZE)
+        # Circular window of pre-scaled rows; write_index points at the oldest row
+        self.buffer = np.zeros((WINDOW_SIZE, len(FEATURES)), dtype=np.float32)
+        self.write_index = 0
+        self.filled = 0
+        # Model input reused across single-row ticks. Shape: (1, 30, 10)
+        self.window_tensor = np.zeros((1, WINDOW_SIZE, len(FEATURES)), dtype=np.float32)
         self.anomaly_count_total = 0
         self.anomaly_count_last_hour = 0
-        self.anomaly_timestamps = []
-        self.sensor_anomaly_counts = {f: 0 for f in FEATURES}
-        self.previous_sensor_states = {f: "NORMAL" for f in FEATURES}
+        self.anomaly_timestamps = deque()
+        self.memory_mb = 0.0 # Cached RSS sample, see get_memory_usage
+        self.memory_sampled_at = 0.0
+        # Per-sensor state as arrays; dicts are only built for results
+        self.sensor_anomalous = np.zeros(len(FEATURES), dtype=bool)
+        self.sensor_transition_counts = np.zeros(len(FEATURES), dtype=np.int64)
         
         self.load_assets()
 
+    @property
+    def threshold(self):
+        """Window-level reconstruction error above which a row is an ANOMALY."""
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value):
+        self._threshold = value
+        # A sensor is anomalous above 1.5x its expected share of the threshold
+        self.per_sensor_threshold = (value / len(FEATURES)) * 1.5
+
+    @property
+    def previous_sensor_states(self):
+        """Latest per-sensor state as {feature: "NORMAL" | "ANOMALY"}."""
+        return dict(zip(FEATURES, [SENSOR_STATE_LABELS[a] for a in self.sensor_anomalous.tolist()]))
+
+    @property
+    def sensor_anomaly_counts(self):
+        """NORMAL -> ANOMALY transitions per sensor as {feature: count}."""
+        return dict(zip(FEATURES, self.sensor_transition_counts.tolist()))
+
     def load_assets(self):
         """Load trained model, scaler, and threshold configuration."""
+        threshold_loaded = False
         try:
-            if os.path.exists(SCALER_PATH):
+            if os.path.exists(SCALER_NPZ_PATH):
+                with np.load(SCALER_NPZ_PATH) as params:
+                    # (x - mn) * scale, folded into x * scale_mul + scale_add
+                    self.scale_mul = params['scale'].astype(np.float32)
+                    self.scale_add = -params['mn'].astype(np.float32) * self.scale_mul
+                    if 'threshold' in params:
+                        self.threshold = float(params['threshold'])
+                        threshold_loaded = True
+                log.info(f"Scaler loaded from {SCALER_NPZ_PATH}")
+            elif os.path.exists(SCALER_PATH):
                 self.scaler = joblib.load(SCALER_PATH)
-                print(f"Scaler loaded from {SCALER_PATH}")
+                log.info(f"Scaler loaded from {SCALER_PATH}")
+                self.cache_scaler_params()
             
-            if os.path.exists(MODEL_PATH) and TF_AVAILABLE:
-                self.model = tf.keras.models.load_model(MODEL_PATH)
-                print(f"Model loaded from {MODEL_PATH}")
-            elif os.path.exists(MODEL_PATH) and not TF_AVAILABLE:
-                print(f"Warning: {MODEL_PATH} exists but TensorFlow is not available. Using simulation.")
+            model_path = next((p for p in (MODEL_PATH, LEGACY_MODEL_PATH) if os.path.exists(p)), None)
             
-            if os.path.exists(THRESHOLD_PATH):
+            # Prefer TFLite (int8, then fp16): smaller weights and no Keras overhead per call
+            if os.path.exists(TFLITE_INT8_PATH) and TF_AVAILABLE:
+                self.load_tflite(TFLITE_INT8_PATH)
+            elif os.path.exists(TFLITE_FP16_PATH) and TF_AVAILABLE:
+                self.load_tflite(TFLITE_FP16_PATH, use_gpu=True)
+            elif model_path and TF_AVAILABLE:
+                # Inference only: no need to restore the training loss/metrics
+                self.model = tf.keras.models.load_model(model_path, compile=False)
+                self.predict_fns = {}
+                self.predict_fn(1) # Trace the single-window shape up front
+                log.info(f"Model loaded from {model_path}")
+            elif model_path and not TF_AVAILABLE:
+                log.warning(f"Warning: {model_path} exists but TensorFlow is not available. Using simulation.")
+            
+            if not threshold_loaded and os.path.exists(THRESHOLD_PATH):
                 with open(THRESHOLD_PATH, 'r') as f:
                     self.threshold = json.load(f).get('anomaly_threshold', 0.05)
-                print(f"Threshold loaded: {self.threshold:.5f}")
+                threshold_loaded = True
+            if threshold_loaded:
+                log.info(f"Threshold loaded: {self.threshold:.5f}")
         except Exception as e:
-            print(f"Warning: Could not load assets ({e}). Falling back to simulation logic.")
+            log.warning(f"Warning: Could not load assets ({e}). Falling back to simulation logic.")
     
+    def cache_scaler_params(self):
+        """
+        Fold the fitted scaler into a per-feature affine transform so each new
+        row is scaled with one multiply-add instead of sklearn's transform().
+        Only StandardScaler and unclipped MinMaxScaler are folded, and only when
+        the fold reproduces scaler.transform(); anything else keeps transform().
+        """
+        if not SKLEARN_AVAILABLE:
+            return
+        n = len(FEATURES)
+        scaler = self.scaler
+        if isinstance(scaler, MinMaxScaler):
+            if scaler.clip:
+                return  # Clipping is not affine
+            # x * scale_ + min_
+            mul, add = scaler.scale_, scaler.min_
+        elif isinstance(scaler, StandardScaler):
+            # (x - mean_) / scale_; mean_ is still fitted when with_mean=False
+            mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+            scale = scaler.scale_ if scaler.with_std else np.ones(n)
+            mul = 1.0 / scale
+            add = -mean * mul
+        else:
+            return  # Other scalers (e.g. RobustScaler): keep using scaler.transform
+        mul = np.asarray(mul, dtype=np.float32)
+        add = np.asarray(add, dtype=np.float32)
+        
+        # An affine fold is pinned down by a few points per feature; check it
+        # against transform() before trusting it
+        probe = np.outer(SCALER_PROBE_VALUES, np.ones(n, dtype=np.float32))
+        if hasattr(scaler, 'feature_names_in_'):
+            expected = scaler.transform(pd.DataFrame(probe, columns=scaler.feature_names_in_))
+        else:
+            expected = scaler.transform(probe)
+        if not np.allclose(probe * mul + add, expected, rtol=1e-4, atol=1e-4):
+            log.warning("Warning: folded scaler does not match scaler.transform(); using transform().")
+            return
+        self.scale_mul = mul
+        self.scale_add = add
+
+    def load_tflite(self, path, use_gpu=False):
+        """Create the TFLite interpreter once and cache its tensor details."""
+        delegates = None
+        if use_gpu:
+            try:
+                delegates = [tf.lite.experimental.load_delegate(GPU_DELEGATE_LIB)]
+            except (ValueError, OSError) as e:
+                log.warning(f"GPU delegate unavailable ({e}). Running {path} on CPU.")
+
+        self.interpreter = tf.lite.Interpreter(
+            model_path=path, experimental_delegates=delegates, num_threads=INFERENCE_THREADS
+        )
+        self.interpreter.allocate_tensors()
+        self.tflite_input = self.interpreter.get_input_details()[0]
+        self.tflite_output = self.interpreter.get_output_details()[0]
+        log.info(f"TFLite model loaded from {path}")
+
+    def predict_fn(self, batch_size):
+        """
+        Concrete function for the Keras model at a fixed batch size, traced once
+        and cached so calls skip predict()'s per-call setup and retrace checks.
+        """
+        fn = self.predict_fns.get(batch_size)
+        if fn is None:
+            spec = tf.TensorSpec(shape=(batch_size, WINDOW_SIZE, len(FEATURES)), dtype=tf.float32)
+            fn = tf.function(lambda x: self.model(x, training=False)).get_concrete_function(spec)
+            self.predict_fns[batch_size] = fn
+        return fn
+
+    def reconstruct(self, windows):
+        """Run the autoencoder on a (batch, WINDOW_SIZE, n_features) stack of windows."""
+        if self.interpreter is None:
+            return self.predict_fn(len(windows))(tf.constant(windows, dtype=tf.float32)).numpy()
+        # The TFLite graph has a fixed batch of 1
+        if len(windows) == 1:
+            return self.invoke_tflite(windows)
+        return np.concatenate([self.invoke_tflite(w[np.newaxis, ...]) for w in windows])
+
+    def invoke_tflite(self, window):
+        """Run the TFLite interpreter on one (1, WINDOW_SIZE, n_features) window."""
+        # Quantize input with the model's (scale, zero_point), dequantize output
+        inp, out = self.tflite_input, self.tflite_output
+        if inp['dtype'] == np.int8:
+            scale, zero_point = inp['quantization']
+            window = np.clip(np.round(window / scale + zero_point), -128, 127).astype(np.int8)
+        else:
+            window = window.astype(inp['dtype'], copy=False)
+
+        self.interpreter.set_tensor(inp['index'], window)
+        self.interpreter.invoke()
+        reconstructed = self.interpreter.get_tensor(out['index'])
+
+        if out['dtype'] == np.int8:
+            scale, zero_point = out['quantization']
+            reconstructed = (reconstructed.astype(np.float32) - zero_point) * scale
+        return reconstructed
+
     def reset_state(self):
         """Reset the inference state when loading a new dataset."""
-        print("[RESET] Resetting inference engine state for new dataset...")
-        self.buffer.clear()
-        self.previous_sensor_states = {f: "NORMAL" for f in FEATURES}
+        log.info("[RESET] Resetting inference engine state for new dataset...")
+        self.buffer.fill(0)
+        self.write_index = 0
+        self.filled = 0
+        self.sensor_anomalous[:] = False
         
         # Reset all anomaly counters
         self.anomaly_count_total = 0
         self.anomaly_count_last_hour = 0
-        self.anomaly_timestamps = []
-        self.sensor_anomaly_counts = {f: 0 for f in FEATURES}
+        self.anomaly_timestamps = deque()
+        self.sensor_transition_counts[:] = 0
         
-        print("[RESET] All anomaly counters reset to 0")
+        log.info("[RESET] All anomaly counters reset to 0")
 
 
 
     def get_memory_usage(self):
-        """Approximate RAM usage of the current process in MB."""
+        """Approximate RAM usage of the current process in MB, resampled every few seconds."""
         if not PSUTIL_AVAILABLE:
             return 0.0
-        process = psutil.Process(os.getpid())
-        return round(process.memory_info().rss / (1024 * 1024), 2)
+        now = time.time()
+        if now - self.memory_sampled_at >= MEMORY_SAMPLE_INTERVAL:
+            self.memory_mb = round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 2)
+            self.memory_sampled_at = now
+        return self.memory_mb
 
     def run_inference(self, sensor_row: dict) -> dict:
         """
         Main inference logic: Preprocess -> Window -> Predict -> Decision.
         """
+        return self.run_inference_batch([sensor_row])[0]
+
+    def run_inference_batch(self, sensor_rows: list) -> list:
+        """
+        Inference over consecutive stream rows. Every full window ending at one
+        of the new rows goes through a single model call; decisions are then
+        applied row by row in stream order. Returns one result per row.
+        """
         start_time = time.time()
         
         # 1. Preprocessing Layer (Real-Time)
-        # Convert dictionary to feature list
-        current_values = [float(sensor_row.get(f, 0)) for f in FEATURES]
-        
-        # Add to window buffer
-        self.buffer.append(current_values)
+        # Convert dictionaries to a (rows, features) matrix
+        values = np.array([[float(row.get(f, 0)) for f in FEATURES] for row in sensor_rows], dtype=np.float32)
         
-        # If buffer is not full, we are still 'Learning'
-        if len(self.buffer) < WINDOW_SIZE:
-            latency = (time.time() - start_time) * 1000
-            return {
-                "status": "LEARNING",
-                "reconstruction_loss": 0,
-                "threshold": self.threshold,
-                "latency_ms": round(latency, 2),
-                "memory_mb": self.get_memory_usage(),
-                "is_anomaly": False,
-                "sensor_states": self.previous_sensor_states,
-                "sensor_anomaly_counts": self.sensor_anomaly_counts
-            }
+        # Normalize the new rows once using the pre-fitted scaler (Do NOT refit)
+        if self.scale_mul is not None:
+            values *= self.scale_mul
+            values += self.scale_add
+        elif self.scaler:
+            values = self.scaler.transform(values).astype(np.float32)
         
         # 2. Window Generation
-        # Shape: (1, 30, 10)
-        window = np.array(self.buffer).reshape(1, WINDOW_SIZE, len(FEATURES))
-        
-        # Normalize using the pre-fitted scaler (Do NOT refit)
-        if self.scaler:
-            window_flat = window.reshape(-1, len(FEATURES))
-            window_scaled = self.scaler.transform(window_flat)
-            window = window_scaled.reshape(1, WINDOW_SIZE, len(FEATURES))
+        n_learning, windows = self.push_rows(values)
+        results = [self.learning_result(start_time) for _ in range(n_learning)]
+        if windows is None:
+            return results
+        n_windows = len(windows)
         
         # 3. Anomaly Detection Logic
-        recon_loss = 0
-        is_anomaly = False
-        sensor_errors = {f: 0.0 for f in FEATURES}
-        
-        if self.model:
+        if self.model or self.interpreter is not None:
+            recon_losses = np.zeros(n_windows)
+            sensor_contribs = np.zeros((n_windows, len(FEATURES)))
             try:
                 # Reconstruct input
-                reconstructed = self.model.predict(window, verbose=0)
-                # Compute reconstruction error (MAE)
-                diff = np.abs(reconstructed - window)
-                recon_loss = np.mean(diff)
+                reconstructed = self.reconstruct(windows)
+                # Compute reconstruction error (MAE) per window
+                diff = np.abs(reconstructed - windows)
+                recon_losses = np.mean(diff, axis=(1, 2))
                 
                 # Per-sensor error contribution
-                sensor_contribs = np.mean(diff, axis=(0, 1))
-                sensor_errors = {FEATURES[i]: float(sensor_contribs[i]) for i in range(len(FEATURES))}
-                
-                # Decision logic: IF loss > threshold -> ANOMALY
-                if recon_loss > self.threshold:
-                    is_anomaly = True
+                sensor_contribs = np.mean(diff, axis=1)
             except Exception as e:
                 pass
         else:
             # Fallback heuristic
-            recon_loss = np.random.uniform(0.01, 0.08)
-            if recon_loss > self.threshold:
-                is_anomaly = True
+            recon_losses = np.random.uniform(0.01, 0.08, size=n_windows)
             # Simulate per-sensor errors
-            for f in FEATURES:
-                sensor_errors[f] = recon_loss * np.random.uniform(0.5, 1.5)
+            sensor_contribs = recon_losses[:, np.newaxis] * np.random.uniform(0.5, 1.5, size=(n_windows, len(FEATURES)))
+        
+        for i in range(n_windows):
+            results.append(self.decide(recon_losses[i], sensor_contribs[i], start_time))
+        return results
+
+    def push_rows(self, values):
+        """
+        Append scaled rows to the ring buffer. Returns (n_learning, windows):
+        how many leading rows still lack a full window, and the
+        (n_windows, WINDOW_SIZE, n_features) windows ending at the rest, or None.
+        """
+        if len(values) == 1:
+            # Common single-row tick: write in place, no history copy
+            self.buffer[self.write_index] = values[0]
+            self.write_index = (self.write_index + 1) % WINDOW_SIZE
+            self.filled = min(self.filled + 1, WINDOW_SIZE)
+            if self.filled < WINDOW_SIZE:
+                return 1, None
+            # Lay the ring out oldest-first in the persistent input tensor
+            split = WINDOW_SIZE - self.write_index
+            self.window_tensor[0, :split] = self.buffer[self.write_index:]
+            self.window_tensor[0, split:] = self.buffer[:self.write_index]
+            return 0, self.window_tensor
+        
+        # Buffered history (oldest first, already scaled) followed by the new rows
+        history = np.roll(self.buffer, -self.write_index, axis=0)[WINDOW_SIZE - self.filled:]
+        stream = np.concatenate((history, values))
+        
+        # Rows that still lack a full window are 'Learning'
+        n_learning = min(len(values), max(0, WINDOW_SIZE - self.filled - 1))
+        n_windows = len(values) - n_learning
+        
+        # Keep the newest rows as the next window history
+        tail = stream[-WINDOW_SIZE:]
+        self.buffer[:len(tail)] = tail
+        self.filled = len(tail)
+        self.write_index = len(tail) % WINDOW_SIZE
+        
+        if n_windows == 0:
+            return n_learning, None
+        # One overlapping window per remaining row. Shape: (n_windows, 30, 10)
+        windows = np.lib.stride_tricks.sliding_window_view(stream, WINDOW_SIZE, axis=0)[-n_windows:]
+        return n_learning, np.ascontiguousarray(windows.transpose(0, 2, 1))
+
+    def learning_result(self, start_time):
+        """Result for a row that arrives before the window is full."""
+        latency = (time.time() - start_time) * 1000
+        return {
+            "status": "LEARNING",
+            "reconstruction_loss": 0,
+            "threshold": self.threshold,
+            "latency_ms": latency,
+            "memory_mb": self.get_memory_usage(),
+            "is_anomaly": False,
+            "sensor_states": self.previous_sensor_states,
+            "sensor_anomaly_counts": self.sensor_anomaly_counts
+        }
+
+    def decide(self, recon_loss, sensor_errors, start_time):
+        """Apply the threshold and sensor-wise tracking to one window's error."""
+        # Decision logic: IF loss > threshold -> ANOMALY
+        is_anomaly = bool(recon_loss > self.threshold)
 
         # 4. Sensor-Wise Tracking
-        current_sensor_states = {}
-        for f in FEATURES:
-            # If sensor contribution > 1.5x of its expected share at threshold
-            is_f_anomalous = sensor_errors[f] > (self.threshold / len(FEATURES)) * 1.5
-            state = "ANOMALY" if is_f_anomalous else "NORMAL"
-            current_sensor_states[f] = state
-            
-            # Transition: NORMAL -> ANOMALY only
-            if state == "ANOMALY" and self.previous_sensor_states[f] == "NORMAL":
-                self.sensor_anomaly_counts[f] += 1
-            self.previous_sensor_states[f] = state
+        # If sensor contribution > 1.5x of its expected share at threshold
+        # Transition: NORMAL -> ANOMALY only
+        update_transitions(sensor_errors, self.per_sensor_threshold,
+                           self.sensor_anomalous, self.sensor_transition_counts)
 
         # Track history
         if is_anomaly:
             self.anomaly_count_total += 1
-            self.anomaly_timestamps.append(time.time())
-            # Clean old timestamps (older than 1 hour)
-            one_hour_ago = time.time() - 3600
-            self.anomaly_timestamps = [t for t in self.anomaly_timestamps if t > one_hour_ago]
+            now = time.time()
+            self.anomaly_timestamps.append(now)
+            # Clean old timestamps (older than 1 hour) from the oldest end
+            one_hour_ago = now - 3600
+            while self.anomaly_timestamps[0] <= one_hour_ago:
+                self.anomaly_timestamps.popleft()
             self.anomaly_count_last_hour = len(self.anomaly_timestamps)
 
         latency = (time.time() - start_time) * 1000 # ms
         
         return {
             "status": "ANOMALY" if is_anomaly else "NORMAL",
-            "reconstruction_loss": round(float(recon_loss), 5),
-            "threshold": round(float(self.threshold), 5),
-            "latency_ms": round(latency, 2),
+            "reconstruction_loss": float(recon_loss),
+            "threshold": self.threshold,
+            "latency_ms": latency,
             "memory_mb": self.get_memory_usage(),
             "is_anomaly": is_anomaly,
-            "sensor_states": current_sensor_states,
+            "sensor_states": self.previous_sensor_states,
             "sensor_anomaly_counts": self.sensor_anomaly_counts,
             "total_anomalies": self.anomaly_count_total,
             "recent_anomalies": self.anomaly_count_last_hour
@@ -13,84 +13,228 @@ import tensorflow as tf
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Input, LSTM, RepeatVector, TimeDistributed, Dense
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
-from sklearn.preprocessing import MinMaxScaler
-import joblib
-import json
+from collections import namedtuple
 import os
+import zlib
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # --- Configuration ---
 DATA_FILE = 'pump_sensor_data_2000_anomaly.csv'
-MODEL_PATH = 'lstm_model.h5'
-SCALER_PATH = 'scaler.pkl'
-THRESHOLD_PATH = 'threshold.json'
+MODEL_PATH = 'lstm_model.keras'
+SCALER_PATH = 'scaler.npz'  # Scaler parameters plus the anomaly threshold
 WINDOW_SIZE = 30
+BATCH_SIZE = 256
+# Adam's default rate was tuned at batch 32; rescale by sqrt(batch ratio)
+LEARNING_RATE = float(0.001 * np.sqrt(BATCH_SIZE / 32))
+THRESHOLD_SAMPLE_WINDOWS = 50_000  # Windows scored for the threshold percentile
+CACHE_DIR = 'cache'  # Preprocessed training windows, reused across runs
 FEATURES = [
     'Motor_RPM', 'Bearing_Temperature_C', 'Oil_Pressure_bar', 'Vibration_mm_s', 
     'Flow_Rate_L_min', 'Suction_Pressure_bar', 'Discharge_Pressure_bar', 
     'Motor_Current_A', 'Casing_Temperature_C', 'Ambient_Temperature_C'
 ]
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def fill_windows(data, window_size, out):
+        """Copy every overlapping window of `data` into `out`, windows split across cores."""
+        for i in prange(out.shape[0]):
+            out[i] = data[i:i + window_size]
+
+    @njit(parallel=True, cache=True)
+    def fill_scaled_windows(data, window_size, mn, scale, out):
+        """Scale each source row once and scatter it into every window that contains it."""
+        n_windows = out.shape[0]
+        for i in prange(data.shape[0]):
+            scaled = (data[i] - mn) * scale
+            for j in range(max(0, i - window_size + 1), min(i + 1, n_windows)):
+                out[j, i - j] = scaled
+
 def create_windows(data, window_size):
     """
     Converts continuous sensor stream into overlapping windows.
     Required shape for LSTM: (samples, time_steps, features)
     """
-    X = []
-    for i in range(len(data) - window_size + 1):
-        X.append(data[i:i + window_size])
-    return np.array(X)
+    data = np.asarray(data, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        # Compiled parallel copy into one preallocated float32 block
+        out = np.empty((len(data) - window_size + 1, window_size, data.shape[1]), dtype=np.float32)
+        fill_windows(data, window_size, out)
+        return out
+    # Strided view over the stream (no per-window copies), then one contiguous copy
+    windows = np.lib.stride_tricks.sliding_window_view(data, (window_size, data.shape[1])).squeeze(1)
+    return np.ascontiguousarray(windows)
 
-def main():
-    print("--- Phase 1: Training LSTM Autoencoder ---")
-    
-    if not os.path.exists(DATA_FILE):
-        print(f"Error: {DATA_FILE} not found.")
-        return
+# Min-max normalization parameters: scaled = (x - mn) * scale
+Scaler = namedtuple('Scaler', ['mn', 'scale'])
+
+def fit_scaler(data):
+    """Fit min-max parameters mapping each column of `data` onto [0, 1]."""
+    mn = data.min(axis=0)
+    data_range = data.max(axis=0) - mn
+    data_range[data_range == 0] = 1.0  # Constant columns map to 0, as MinMaxScaler does
+    return Scaler(mn.astype(np.float32), (1.0 / data_range).astype(np.float32))
+
+def save_scaler(scaler, threshold, path):
+    """Persist the scaler and anomaly threshold together in one compressed archive."""
+    np.savez_compressed(path, mn=scaler.mn, scale=scaler.scale, threshold=np.float32(threshold))
+
+def load_scaler(path):
+    with np.load(path) as params:
+        return Scaler(params['mn'], params['scale'])
+
+def create_scaled_windows(data, window_size, scaler):
+    """
+    Fused scaling + windowing: one pass over the raw rows instead of a scaled
+    copy followed by windowing.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        out = np.empty((len(data) - window_size + 1, window_size, data.shape[1]), dtype=np.float32)
+        fill_scaled_windows(data, window_size, scaler.mn, scaler.scale, out)
+        return out
+    return create_windows((data - scaler.mn) * scaler.scale, window_size)
+
+def reconstruction_errors(model, X, batch_size=1024):
+    """
+    Per-window reconstruction MAE. Errors are reduced inside a tf.function batch
+    by batch, so only the 1-D error vector is materialized, not the predictions.
+    """
+    @tf.function(input_signature=[tf.TensorSpec(shape=(None,) + X.shape[1:], dtype=tf.float32)])
+    def batch_mae(x):
+        y = model(x, training=False)
+        return tf.reduce_mean(tf.abs(y - x), axis=[1, 2])
 
+    # Fill one pre-sized buffer; peak memory is a single batch of predictions
+    mae = np.empty(len(X), dtype=np.float32)
+    for i in range(0, len(X), batch_size):
+        mae[i:i + batch_size] = batch_mae(X[i:i + batch_size]).numpy()
+    return mae
+
+def prepare_training_windows(data_file, window_size):
+    """Parse, clean and scale the NORMAL rows of `data_file` into training windows."""
     # 1. Load Data
-    print(f"Reading {DATA_FILE}...")
-    df = pd.read_csv(DATA_FILE)
+    print(f"Reading {data_file}...")
+    # Parse only the columns used, straight to float32: Keras trains in float32
+    # anyway, and it halves what the scaler and windows move
+    df = pd.read_csv(
+        data_file,
+        usecols=FEATURES + ['machine_status'],
+        dtype={f: 'float32' for f in FEATURES},
+        engine='c'
+    )
     
     # 2. Preprocessing Layer
     # Handle missing values (forward-fill)
-    df = df.ffill()
+    df.ffill(inplace=True)
     
-    # Normalize sensor values using MinMaxScaler
+    # Normalize sensor values to [0, 1] (min-max)
     # IMPORTANT: We only fit the scaler on NORMAL data to define the 'normal' range
-    scaler = MinMaxScaler()
-    normal_data_raw = df[df.machine_status == "NORMAL"][FEATURES]
+    raw = df[FEATURES].to_numpy(dtype=np.float32, copy=False)
+    normal_mask = df['machine_status'].to_numpy() == "NORMAL"
+    normal_data_raw = raw[normal_mask]
     
     print(f"Fitting scaler on {len(normal_data_raw)} normal samples...")
-    scaler.fit(normal_data_raw)
-    
-    # Transform full dataset
-    scaled_values = scaler.transform(df[FEATURES])
-    df_scaled = pd.DataFrame(scaled_values, columns=FEATURES)
-    df_scaled['machine_status'] = df['machine_status']
+    scaler = fit_scaler(normal_data_raw)
     
     # 3. Sliding Window Generator
-    # Train ONLY on NORMAL behavior
-    train_data = df_scaled[df_scaled.machine_status == "NORMAL"][FEATURES].values
-    X_train = create_windows(train_data, WINDOW_SIZE)
+    # Train ONLY on NORMAL behavior; rows are scaled as they are windowed
+    X_train = create_scaled_windows(normal_data_raw, window_size, scaler)
     
-    print(f"Training sequences generated: {X_train.shape}")
+    return X_train, scaler
+
+def load_training_windows(data_file, window_size):
+    """
+    Training windows and scaler for (data_file, window_size), cached on disk.
+    The cache key covers the file's size and mtime, so edits rebuild it; the
+    windows are memory-mapped back so repeat runs skip parsing and windowing.
+    """
+    st = os.stat(data_file)
+    key = zlib.crc32(f"{os.path.abspath(data_file)}|{st.st_size}|{st.st_mtime_ns}|{window_size}|{FEATURES}".encode())
+    windows_path = os.path.join(CACHE_DIR, f"X_train_{key:08x}.npy")
+    scaler_path = os.path.join(CACHE_DIR, f"scaler_{key:08x}.npz")
     
-    # 4. Machine Learning Layer: LSTM Autoencoder
-    # Input -> [Encoder] -> Bottleneck -> [Decoder] -> Output
-    inputs = Input(shape=(WINDOW_SIZE, len(FEATURES)))
+    if os.path.exists(windows_path) and os.path.exists(scaler_path):
+        print(f"Loading cached training windows from {windows_path}...")
+        return np.load(windows_path, mmap_mode='r'), load_scaler(scaler_path)
     
-    # Encoder
-    x = LSTM(64, activation='relu', return_sequences=False)(inputs)
+    X_train, scaler = prepare_training_windows(data_file, window_size)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write under temporary names and rename, windows first and scaler last: an
+    # interrupted run never leaves a truncated file at a cache path
+    with open(windows_path + '.tmp', 'wb') as f:
+        np.save(f, X_train)
+    os.replace(windows_path + '.tmp', windows_path)
+    with open(scaler_path + '.tmp', 'wb') as f:
+        np.savez(f, mn=scaler.mn, scale=scaler.scale)
+    os.replace(scaler_path + '.tmp', scaler_path)
+    return X_train, scaler
+
+def build_autoencoder(window_size):
+    """
+    LSTM Autoencoder under the current global Keras precision policy.
+    Input -> [Encoder] -> Bottleneck -> [Decoder] -> Output
+    """
+    inputs = Input(shape=(window_size, len(FEATURES)))
+    
+    # Encoder (default tanh/sigmoid activations keep the fused cuDNN kernel on GPU)
+    x = LSTM(64, return_sequences=False)(inputs)
     
     # Bottleneck (RepeatVector adapts the compressed state back to window size)
-    x = RepeatVector(WINDOW_SIZE)(x)
+    x = RepeatVector(window_size)(x)
     
     # Decoder
-    x = LSTM(64, activation='relu', return_sequences=True)(x)
-    outputs = TimeDistributed(Dense(len(FEATURES)))(x)
+    x = LSTM(64, return_sequences=True)(x)
+    # Output layer stays float32 so the MAE loss and threshold are computed at full precision
+    outputs = TimeDistributed(Dense(len(FEATURES), dtype='float32'), dtype='float32')(x)
     
-    model = Model(inputs, outputs)
-    model.compile(optimizer='adam', loss='mae') # Mean Absolute Error for reconstruction
+    return Model(inputs, outputs)
+
+def float32_copy(model, window_size):
+    """
+    Rebuild `model` under the float32 policy with the same weights. A model
+    trained with mixed_float16 keeps that policy on every layer once saved, so
+    CPU serving and the TFLite conversion would run float16 LSTMs.
+    """
+    policy = tf.keras.mixed_precision.global_policy()
+    tf.keras.mixed_precision.set_global_policy('float32')
+    try:
+        serving_model = build_autoencoder(window_size)
+    finally:
+        tf.keras.mixed_precision.set_global_policy(policy)
+    # Mixed precision keeps the variables in float32, so they copy over as-is
+    serving_model.set_weights(model.get_weights())
+    return serving_model
+
+def build_and_train(data_file=DATA_FILE, window_size=WINDOW_SIZE, model_path=MODEL_PATH,
+                    scaler_path=SCALER_PATH):
+    """
+    Runs the full pipeline for one dataset configuration: load, scale, window,
+    train, pick the threshold and save the model plus scaler/threshold archive.
+    Returns (model, threshold). Precision follows the global Keras policy.
+    """
+    use_mixed_precision = tf.keras.mixed_precision.global_policy().name == 'mixed_float16'
+
+    X_train, scaler = load_training_windows(data_file, window_size)
+    
+    print(f"Training sequences generated: {X_train.shape}")
+    
+    # 4. Machine Learning Layer: LSTM Autoencoder
+    model = build_autoencoder(window_size)
+    optimizer = tf.keras.optimizers.Adam(learning_rate=LEARNING_RATE)
+    if use_mixed_precision:
+        # Scale the loss so small float16 gradients do not underflow
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+    # Mean Absolute Error for reconstruction. On CPU, XLA fuses the LSTM unroll,
+    # RepeatVector and TimeDistributed Dense of the train step into one compiled
+    # graph. On GPU the fused cuDNN LSTM kernel is faster, and Keras cannot
+    # XLA-compile cuDNN LSTMs anyway, so XLA is only requested without a GPU.
+    use_xla = not tf.config.list_physical_devices('GPU')
+    model.compile(optimizer=optimizer, loss='mae', jit_compile=use_xla)
     
     print("Model Summary:")
     model.summary()
@@ -102,33 +246,64 @@ def main():
         ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=2)
     ]
     
+    # Input pipeline: hold out the last 10% for validation (as validation_split did),
+    # prefetch so batch preparation overlaps the training step
+    split = int(len(X_train) * 0.9)
+    train_ds = (tf.data.Dataset.from_tensor_slices((X_train[:split], X_train[:split]))
+                .shuffle(8192).batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE))
+    val_ds = (tf.data.Dataset.from_tensor_slices((X_train[split:], X_train[split:]))
+              .batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE))
+    
     model.fit(
-        X_train, X_train,
+        train_ds,
+        validation_data=val_ds,
         epochs=20,
-        batch_size=32,
-        validation_split=0.1,
         callbacks=callbacks,
         verbose=1
     )
     
+    # Serve in float32: the threshold is computed with, and saved from, the same model
+    if use_mixed_precision:
+        model = float32_copy(model, window_size)
+    
     # 5. Anomaly Detection Logic: Threshold Calculation
     # Calculate reconstruction error on training data (Normal only)
     print("Calculating anomaly threshold...")
-    X_train_pred = model.predict(X_train, verbose=0)
-    train_mae = np.mean(np.abs(X_train_pred - X_train), axis=(1, 2))
+    # The 99th percentile is stable on a uniform subsample; cap the windows scored
+    X_threshold = X_train
+    if len(X_train) > THRESHOLD_SAMPLE_WINDOWS:
+        idx = np.random.default_rng(0).choice(len(X_train), size=THRESHOLD_SAMPLE_WINDOWS, replace=False)
+        X_threshold = X_train[np.sort(idx)]
+    train_mae = reconstruction_errors(model, X_threshold)
     
     # Threshold = 99th percentile of normal reconstruction error
     # This means 99% of normal data is below this threshold.
-    threshold = np.percentile(train_mae, 99)
+    # Nearest-rank percentile via partial selection (O(N)) instead of a full sort
+    k = int(np.ceil(0.99 * len(train_mae))) - 1
+    threshold = np.partition(train_mae, k)[k]
     print(f"Optimal Threshold (99th percentile): {threshold:.5f}")
     
     # 6. Save Assets
-    print("Saving model, scaler, and threshold...")
-    model.save(MODEL_PATH)
-    joblib.dump(scaler, SCALER_PATH)
-    with open(THRESHOLD_PATH, 'w') as f:
-        json.dump({"anomaly_threshold": float(threshold)}, f)
+    print("Saving model and scaler/threshold archive...")
+    model.save(model_path)
+    save_scaler(scaler, threshold, scaler_path)
+    
+    return model, threshold
+
+def main():
+    print("--- Phase 1: Training LSTM Autoencoder ---")
+    tf.keras.backend.set_floatx('float32')
+    
+    # Mixed precision runs the LSTM matmuls on GPU tensor cores; on CPU it only slows training
+    if tf.config.list_physical_devices('GPU'):
+        tf.keras.mixed_precision.set_global_policy('mixed_float16')
+        print("GPU detected: training with mixed_float16 precision")
+    
+    if not os.path.exists(DATA_FILE):
+        print(f"Error: {DATA_FILE} not found.")
+        return
     
+    build_and_train()
     print("Phase 1 Complete. Assets saved to disk.")
 
 if __name__ == "__main__":
@@ -0,0 +1,33 @@
+"""
+Advanced Anomaly Detection for Industrial Pumps
+Production WSGI Entry Point
+
+Serves the Flask backend from a real WSGI server instead of Werkzeug's
+single-threaded development server (`python app.py`):
+
+    gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5003 wsgi:application
+
+The stream cursor, anomaly counters and inference window live in process
+memory, so scale with threads rather than workers - every extra worker would
+replay its own copy of the dataset with its own counters.
+
+On Windows, where gunicorn is unavailable, use waitress instead:
+
+    waitress-serve --threads=8 --port=5003 wsgi:application
+
+In front of either, let nginx serve the dashboard files directly so Python
+workers only handle /api/* and the page itself (which versions the asset URLs):
+
+    location /api/ { proxy_pass http://127.0.0.1:5003; }
+    location = / { proxy_pass http://127.0.0.1:5003; }
+    location / {
+        root /path/to/app;
+        try_files $uri @backend;
+        expires 1h;
+    }
+    location @backend { proxy_pass http://127.0.0.1:5003; }
+"""
+
+from app import app
+
+application = app